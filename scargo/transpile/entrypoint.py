@@ -1,11 +1,9 @@
 import ast
 from typing import Any, Dict, List, Optional
 
-import astor
-
 from scargo.core import WorkflowParams
 from scargo.errors import ScargoTranspilerError
-from scargo.transpile import resolve
+from scargo.transpile import resolve, utils
 from scargo.transpile.types import Context
 from scargo.transpile.workflow_step import WorkflowStep, make_workflow_step
 
@@ -26,10 +24,14 @@ class EntrypointTranspiler(ast.NodeVisitor):
         mount_points: Dict[str, str],
         tree: ast.Module,
     ) -> None:
-        self.tree = tree
         self.steps: List[List[WorkflowStep]] = []
         self.context = Context(
-            locals=script_locals, inputs={}, outputs={}, workflow_params=workflow_params, mount_points=mount_points
+            locals=script_locals,
+            inputs={},
+            outputs={},
+            workflow_params=workflow_params,
+            mount_points=mount_points,
+            toplevel_funcs=utils.index_toplevel_funcs(tree),
         )
 
     def visit_Call(self, node: ast.Call) -> None:
@@ -44,7 +46,6 @@ class EntrypointTranspiler(ast.NodeVisitor):
                 make_workflow_step(
                     call_node=node,
                     context=self.context,
-                    tree=self.tree,
                 )
             ]
         )
@@ -91,6 +92,7 @@ class EntrypointTranspiler(ast.NodeVisitor):
                     outputs=self.context.outputs,
                     workflow_params=self.context.workflow_params,
                     mount_points=self.context.mount_points,
+                    toplevel_funcs=self.context.toplevel_funcs,
                 ),
             )
             transput_name = node.targets[0].id
@@ -99,7 +101,7 @@ class EntrypointTranspiler(ast.NodeVisitor):
             else:
                 self.context.outputs[transput_name] = resolved_transput
         else:
-            exec(astor.to_source(node), {}, self.context.locals)
+            exec(ast.unparse(node), {}, self.context.locals)
 
     def visit_If(self, node: ast.If) -> None:
         """
@@ -108,9 +110,9 @@ class EntrypointTranspiler(ast.NodeVisitor):
         TODO: support nested if-statements
         """
         all_steps: List[WorkflowStep] = []
-        all_steps.append(resolve.resolve_If(node, self.tree, self.context))
+        all_steps.append(resolve.resolve_If(node, self.context))
         for child in node.orelse:
             assert isinstance(child, ast.If)
-            all_steps.append(resolve.resolve_If(child, self.tree, self.context))
+            all_steps.append(resolve.resolve_If(child, self.context))
 
         self.steps.append(all_steps)
@@ -1,15 +1,12 @@
 import ast
 from typing import Dict, Any
 
-import astor
-
-from scargo.core import WorkflowParams
+from scargo.core import MountPoints, WorkflowParams
 from scargo.errors import ScargoTranspilerError
 from scargo.transpile.types import Context, FileAny, FileTmp, FilePut, Parameter, Transput
 from scargo.transpile.utils import (
     get_variables_from_call,
     is_workflow_param,
-    is_mount_points,
 )
 from scargo.transpile.workflow_step import WorkflowStep, make_workflow_step
 
@@ -29,13 +26,9 @@ def resolve_workflow_param(node: ast.Subscript, locals_context: Dict[str, Any])
     Given a Subscript node known to be a Workflow Parameter use the locals_context of the scargo script and the AST to
     transpile this node into a reference to the global Argo workflow parameters.
     """
-    subscripted_object = node.value.id
+    subscripted_object = locals_context.get(node.value.id)
     sub_slice = resolve_sub_slice(node)
-    if (
-        subscripted_object in locals_context
-        and isinstance(locals_context[subscripted_object], WorkflowParams)
-        and isinstance(locals_context[subscripted_object][sub_slice], str)
-    ):
+    if isinstance(subscripted_object, WorkflowParams) and isinstance(subscripted_object[sub_slice], str):
         return "{{" + f"workflow.parameters.{sub_slice}" + "}}"
     else:
         raise ScargoTranspilerError(f"Cannot resolve parameter value from node:\n{ast.dump(node, indent=3)}")
@@ -56,24 +49,31 @@ def resolve_subscript(node: ast.Subscript, context: Context) -> str:
     """
     assert isinstance(node, ast.Subscript)
 
-    if is_workflow_param(node, context.locals):
-        return resolve_workflow_param(node, context.locals)
-    elif is_mount_points(node, context.locals):
+    subscripted_object_name = node.value.id
+    context_locals = context.locals
+    # look the subscripted object up once and dispatch on its type
+    subscripted_object = context_locals.get(subscripted_object_name)
+    if isinstance(subscripted_object, WorkflowParams):
+        return resolve_workflow_param(node, context_locals)
+    elif isinstance(subscripted_object, MountPoints):
         return resolve_mount_points(node, context.mount_points)
     else:
         # TODO: should this error only be triggered if it also isn't resolvable via the locals of the function?
-        raise ScargoTranspilerError(f"Cannot resolve {node.value.id}[{node.slice.value}].")
+        raise ScargoTranspilerError(f"Cannot resolve {subscripted_object_name}[{node.slice.value}].")
 
 
-def resolve_artifact(artifact_node: ast.Call, context: Context) -> FileAny:
+def _resolve_tmp_artifact(artifact_node: ast.Call) -> FileTmp:
     """
-    Resolve a Transput's artifact initialization into FileTmp and FilePut as an intermediate step before transpilation
-    to Argo YAML.
+    Resolve a TmpTransput artifact initialization into a FileTmp.
     """
-    if artifact_node.func.id == "TmpTransput":
-        path = get_variables_from_call(artifact_node, ["name"])["name"]
-        return FileTmp(path=path.value)
+    path = get_variables_from_call(artifact_node, ["name"])["name"]
+    return FileTmp(path=path.value)
 
+
+def _resolve_put_artifact(artifact_node: ast.Call, context: Context) -> FilePut:
+    """
+    Resolve a FileInput/FileOutput artifact initialization into a FilePut.
+    """
     vars = get_variables_from_call(artifact_node, ["root", "path", "name"])
 
     root_node = vars["root"]
@@ -97,72 +97,112 @@ def resolve_artifact(artifact_node: ast.Call, context: Context) -> FileAny:
     return FilePut(root=root, path=path)
 
 
+def resolve_artifact(artifact_node: ast.Call, context: Context) -> FileAny:
+    """
+    Resolve a Transput's artifact initialization into FileTmp and FilePut as an intermediate step before transpilation
+    to Argo YAML.
+    """
+    if artifact_node.func.id == "TmpTransput":
+        return _resolve_tmp_artifact(artifact_node)
+    else:
+        return _resolve_put_artifact(artifact_node, context)
+
+
+def _resolve_constant_parameter(value: ast.Constant, context: Context) -> Parameter:
+    return Parameter(value=value.value, origin=None)
+
+
+def _resolve_subscript_parameter(value: ast.Subscript, context: Context) -> Parameter:
+    subscript = value.value
+    slice_val = resolve_sub_slice(value)
+    if isinstance(subscript, ast.Attribute):
+        assert subscript.attr == "parameters"
+        attr_name = subscript.value.id
+
+        if attr_name in context.inputs:
+            context_param = context.inputs[attr_name].parameters[slice_val]
+        elif attr_name in context.outputs:
+            context_param = context.outputs[attr_name].parameters[slice_val]
+        else:
+            raise ScargoTranspilerError("Only ScargoInput and ScargoOutput work.")
+
+        return Parameter(value=context_param.value, origin=context_param.origin)
+    else:
+        return Parameter(value=resolve_subscript(value, context))
+
+
+_PARAMETER_RESOLVERS = {
+    ast.Constant: _resolve_constant_parameter,
+    ast.Subscript: _resolve_subscript_parameter,
+}
+
+
+def _resolve_parameter(value: ast.expr, context: Context) -> Parameter:
+    resolver = _PARAMETER_RESOLVERS.get(type(value))
+    if resolver is None:
+        raise ScargoTranspilerError("Should be a subscript or a constant?")
+    return resolver(value, context)
+
+
 def resolve_transput_parameters(raw_parameters: ast.Dict, context: Context) -> Dict[str, Parameter]:
     """
     Resolve a Transput's parameters into a dictionary as an intermediary step before transpilation to Argo YAML.
     """
-    parameters = {}
-    for name, value in zip(raw_parameters.keys, raw_parameters.values):
-        if not isinstance(name, ast.Constant):
-            raise ScargoTranspilerError("Scargo can only transpile constant string dictionary keys.")
-
-        if isinstance(value, ast.Constant):
-            parameters[name.value] = Parameter(value=value.value, origin=None)
-        elif isinstance(value, ast.Subscript):
-            subscript = value.value
-            slice_val = resolve_sub_slice(value)
-            if isinstance(subscript, ast.Attribute):
-                assert subscript.attr == "parameters"
-                attr_name = subscript.value.id
-
-                if attr_name in context.inputs:
-                    context_param = context.inputs[attr_name].parameters[slice_val]
-                elif attr_name in context.outputs:
-                    context_param = context.outputs[attr_name].parameters[slice_val]
-                else:
-                    raise ScargoTranspilerError("Only ScargoInput and ScargoOutput work.")
-
-                parameters[name.value] = Parameter(value=context_param.value, origin=context_param.origin)
-            else:
-                parameters[name.value] = Parameter(value=resolve_subscript(value, context))
-        else:
-            raise ScargoTranspilerError("Should be a subscript or a constant?")
+    if not all(isinstance(name, ast.Constant) for name in raw_parameters.keys):
+        raise ScargoTranspilerError("Scargo can only transpile constant string dictionary keys.")
+
+    return {
+        name.value: _resolve_parameter(value, context)
+        for name, value in zip(raw_parameters.keys, raw_parameters.values)
+    }
 
-    return parameters
+
+def _resolve_constant_artifact(value: ast.Constant, context: Context) -> Any:
+    return value.value
+
+
+def _resolve_subscript_artifact(value: ast.Subscript, context: Context) -> FileAny:
+    attribute = value.value
+    assert isinstance(attribute, ast.Attribute)
+    assert attribute.attr == "artifacts"
+    root = attribute.value.id
+
+    artifact_name = resolve_sub_slice(value)
+    context_inputs = context.inputs
+    context_outputs = context.outputs
+    if root in context_inputs:
+        return context_inputs[root].artifacts[artifact_name]
+    elif root in context_outputs:
+        return context_outputs[root].artifacts[artifact_name]
+    else:
+        raise ScargoTranspilerError("Transput (probably TmpTransput) not found in previous input or output artifacts.")
+
+
+_ARTIFACT_RESOLVERS = {
+    ast.Constant: _resolve_constant_artifact,
+    ast.Call: resolve_artifact,
+    ast.Subscript: _resolve_subscript_artifact,
+}
+
+
+def _resolve_transput_artifact(value: ast.expr, context: Context) -> FileAny:
+    resolver = _ARTIFACT_RESOLVERS.get(type(value))
+    if resolver is None:
+        raise ScargoTranspilerError("Unrecognized assignment for artifact.")
+    return resolver(value, context)
 
 
 def resolve_transput_artifacts(raw_artifacts: ast.Dict, context: Context) -> Dict[str, FileAny]:
     """
     Resolve a Transput's artifact into a dictionary mapping artifact names to their associate FilePut or FileTmp.
     """
-    artifacts = {}
-    for name, value in zip(raw_artifacts.keys, raw_artifacts.values):
-        if not isinstance(name, ast.Constant):
-            raise ScargoTranspilerError("Scargo can only handle constant dictionary keys.")
-
-        if isinstance(value, ast.Constant):
-            artifacts[name.value] = value.value
-        elif isinstance(value, ast.Call):
-            artifacts[name.value] = resolve_artifact(value, context)
-        elif isinstance(value, ast.Subscript):
-            attribute = value.value
-            assert isinstance(attribute, ast.Attribute)
-            assert attribute.attr == "artifacts"
-            root = attribute.value.id
-
-            artifact_name = resolve_sub_slice(value)
-            if root in context.inputs:
-                artifacts[name.value] = context.inputs[root].artifacts[artifact_name]
-            elif root in context.outputs:
-                artifacts[name.value] = context.outputs[root].artifacts[artifact_name]
-            else:
-                raise ScargoTranspilerError(
-                    "Transput (probably TmpTransput) not found in previous input or output artifacts."
-                )
-        else:
-            raise ScargoTranspilerError("Unrecognized assignment for artifact.")
+    if not all(isinstance(name, ast.Constant) for name in raw_artifacts.keys):
+        raise ScargoTranspilerError("Scargo can only handle constant dictionary keys.")
 
-    return artifacts
+    return {
+        name.value: _resolve_transput_artifact(value, context)
+        for name, value in zip(raw_artifacts.keys, raw_artifacts.values)
+    }
 
 
 def resolve_transput(transput_node: ast.Call, context: Context) -> Transput:
@@ -172,11 +212,18 @@ def resolve_transput(transput_node: ast.Call, context: Context) -> Transput:
     # TODO: use exec to resolve transput as an initial sanity check
     parameters = None
     artifacts = None
-    node_args = get_variables_from_call(transput_node, ["parameters", "artifacts"])
-
-    if "parameters" in node_args:
-        raw_parameters = node_args["parameters"]
 
+    # pick out the two fields of ScargoInput/ScargoOutput directly, whether passed positionally or as keywords
+    raw_args = transput_node.args
+    raw_parameters = raw_args[0] if len(raw_args) > 0 else None
+    raw_artifacts = raw_args[1] if len(raw_args) > 1 else None
+    for keyword in transput_node.keywords:
+        if keyword.arg == "parameters":
+            raw_parameters = keyword.value
+        elif keyword.arg == "artifacts":
+            raw_artifacts = keyword.value
+
+    if raw_parameters is not None:
         if not isinstance(raw_parameters, ast.Dict):
             raise ScargoTranspilerError("Transputs parameters should be assigned dictionaries.")
 
@@ -185,9 +232,7 @@ def resolve_transput(transput_node: ast.Call, context: Context) -> Transput:
         if len(parameters) == 0:
             parameters = None
 
-    if "artifacts" in node_args:
-        raw_artifacts = node_args["artifacts"]
-
+    if raw_artifacts is not None:
         if not isinstance(raw_artifacts, ast.Dict):
             raise ScargoTranspilerError("Transputs parameters should be assigned dictionaries.")
 
@@ -202,13 +247,28 @@ def resolve_transput(transput_node: ast.Call, context: Context) -> Transput:
     return Transput(parameters=parameters, artifacts=artifacts)
 
 
+# source symbols of the comparison operators that can appear in a condition
+_COMPARISON_SYMBOLS = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Is: "is",
+    ast.IsNot: "is not",
+    ast.In: "in",
+    ast.NotIn: "not in",
+}
+
+
 def resolve_compare(node: ast.expr, context_locals: Dict[str, Any]) -> str:
     """
     Resolve a variable involved in a comparison.
 
     TODO: allow for other comparison inputs, such as Transputs and CSV values
     """
-    if isinstance(node, ast.Subscript) and is_workflow_param(node, context_locals):
+    if isinstance(node, ast.Subscript) and is_workflow_param(node.value.id, context_locals):
         return resolve_workflow_param(node, context_locals)
     elif isinstance(node, ast.Constant):
         return str(node.value)
@@ -235,13 +295,13 @@ def resolve_cond(node: ast.If, context_locals: Dict[str, Any]) -> str:
     return " ".join(
         (
             resolve_compare(compare.left, context_locals),
-            astor.op_util.get_op_symbol(compare.ops[0]),
+            _COMPARISON_SYMBOLS[type(compare.ops[0])],
             resolve_compare(compare.comparators[0], context_locals),
         )
     )
 
 
-def resolve_If(node: ast.If, tree: ast.Module, context: Context) -> WorkflowStep:
+def resolve_If(node: ast.If, context: Context) -> WorkflowStep:
     """
     Make the resolved condition string and body into a workflow step.
 
@@ -256,7 +316,6 @@ def resolve_If(node: ast.If, tree: ast.Module, context: Context) -> WorkflowStep
         condition = resolve_cond(node, context.locals)
         return make_workflow_step(
             call_node=body.value,
-            tree=tree,
             context=context,
             condition=condition,
         )
@@ -36,7 +36,14 @@ def test_resolve_workflow_param(node, locals_context, expected):
                     ast.Call(func=ast.Name(id="TmpTransput"), args=[ast.Constant(value="out-file.txt")], keywords=[])
                 ],
             ),
-            Context(locals={}, inputs={}, outputs={}, workflow_params=WorkflowParams({}), mount_points={}),
+            Context(
+                locals={},
+                inputs={},
+                outputs={},
+                workflow_params=WorkflowParams({}),
+                mount_points={},
+                toplevel_funcs={},
+            ),
             {"out-file": FileTmp(path="out-file.txt", origin=None)},
         ),
         # single file output
@@ -86,6 +93,7 @@ def test_resolve_workflow_param(node, locals_context, expected):
                 outputs={},
                 workflow_params=WorkflowParams({"input-path": "testing/scargo-examples", "input-csv": "add_alpha.csv"}),
                 mount_points={"root": "pq-dataxfer-tmp"},
+                toplevel_funcs={},
             ),
             {
                 "csv-file": FilePut(
@@ -122,6 +130,7 @@ def test_resolve_workflow_param(node, locals_context, expected):
                 },
                 workflow_params=WorkflowParams({}),
                 mount_points={},
+                toplevel_funcs={},
             ),
             {"init-file": FileTmp(path="out-file.txt", origin=Origin(step="get-nth-word", name="out-file"))},
         ),
@@ -137,7 +146,14 @@ def test_resolve_transput_artifacts(raw_params, context, expected):
         # single parameter without a value
         (
             ast.Dict(keys=[ast.Constant(value="out-val")], values=[ast.Constant(value=None)]),
-            Context(locals={}, inputs={}, outputs={}, workflow_params=WorkflowParams({}), mount_points={}),
+            Context(
+                locals={},
+                inputs={},
+                outputs={},
+                workflow_params=WorkflowParams({}),
+                mount_points={},
+                toplevel_funcs={},
+            ),
             {"out-val": Parameter(value=None, origin=None)},
         ),
         # multiple subscripts
@@ -162,6 +178,7 @@ def test_resolve_transput_artifacts(raw_params, context, expected):
                 outputs={},
                 workflow_params=WorkflowParams({"word-index": "1", "pre-word": "pre", "post-word": "post"}),
                 mount_points={},
+                toplevel_funcs={},
             ),
             {
                 "word-index": Parameter(value="{{workflow.parameters.word-index}}", origin=None),
@@ -193,6 +210,7 @@ def test_resolve_transput_artifacts(raw_params, context, expected):
                 },
                 workflow_params=WorkflowParams({}),
                 mount_points={},
+                toplevel_funcs={},
             ),
             {"init-value": Parameter(value=None, origin=Origin(step="get-nth-word", name="out-val"))},
         ),
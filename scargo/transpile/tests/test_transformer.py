@@ -48,6 +48,45 @@ def test_resolve_subscript():
     )
 
 
+def test_resolve_subscript_shares_strings():
+    """
+    Repeated references to the same input parameter should resolve to the same (interned) string object.
+    """
+    first, second = (
+        SourceToArgoTransformer._resolve_subscript(
+            ast.Subscript(
+                value=ast.Attribute(value=ast.Name(id="scargo_in"), attr="parameters"),
+                slice=ast.Constant(value="init-value", kind=None),
+            ),
+            input_arg="scargo_in",
+            output_arg="scargo_out",
+        )
+        for _ in range(2)
+    )
+
+    assert first == r"{{inputs.parameters.init-value}}"
+    assert first is second
+
+
+def test_resolve_subscript_keeps_key_types():
+    """
+    Keys that compare equal but are formatted differently (`1`, `1.0`, `True`) shouldn't share a cached reference.
+    """
+    resolved = [
+        SourceToArgoTransformer._resolve_subscript(
+            ast.Subscript(
+                value=ast.Attribute(value=ast.Name(id="scargo_in"), attr="parameters"),
+                slice=ast.Constant(value=key, kind=None),
+            ),
+            input_arg="scargo_in",
+            output_arg="scargo_out",
+        )
+        for key in (1, 1.0, True)
+    ]
+
+    assert resolved == [r"{{inputs.parameters.1}}", r"{{inputs.parameters.1.0}}", r"{{inputs.parameters.True}}"]
+
+
 @pytest.mark.parametrize(
     "call_val, args, keywords, inputs, outputs, exp_path, exp_mode",
     [
@@ -0,0 +1,17 @@
+import pytest
+
+from scargo.transpile.types import FileTmp, Parameter, Transput
+
+
+@pytest.mark.parametrize(
+    "transput, expected",
+    [
+        (Transput(), False),
+        (Transput(parameters={}, artifacts={}), False),
+        (Transput(parameters={"x": Parameter(value="1")}), True),
+        (Transput(artifacts={"out-file": FileTmp(path="out-file.txt")}), True),
+        (Transput(parameters={"x": Parameter(value="1")}, artifacts={"out-file": FileTmp(path="out-file.txt")}), True),
+    ],
+)
+def test_transput_exist(transput, expected):
+    assert transput.exist is expected
@@ -3,7 +3,7 @@ from typing import List, Union
 
 import pytest
 
-from scargo.transpile.utils import get_variables_from_call
+from scargo.transpile.utils import get_variables_from_call, index_toplevel_funcs
 
 
 def compare_ast(node1: Union[ast.expr, List[ast.expr]], node2: Union[ast.expr, List[ast.expr]]) -> bool:
@@ -92,3 +92,26 @@ def compare_ast(node1: Union[ast.expr, List[ast.expr]], node2: Union[ast.expr, L
 def test_get_variables_from_call(node, args, expected):
     for name, value in get_variables_from_call(node, args).items():
         assert compare_ast(value, expected[name])
+
+
+def test_get_variables_from_call_leaves_node_untouched():
+    source = "FileOutput(root=mount_points['root'], path=workflow_parameters['output-path'])"
+    node = ast.parse(source, mode="eval").body
+
+    get_variables_from_call(node)
+
+    assert compare_ast(node, ast.parse(source, mode="eval").body)
+
+
+def test_index_toplevel_funcs():
+    tree = ast.parse(
+        "mount_points = MountPoints({})\n"
+        "def add_alpha(scargo_in, scargo_out):\n"
+        "    def inner():\n"
+        "        pass\n"
+        "def add_alpha(scargo_in, scargo_out):\n"
+        "    pass\n"
+    )
+
+    # the first definition wins for functions defined more than once
+    assert index_toplevel_funcs(tree) == {"add_alpha": tree.body[1]}
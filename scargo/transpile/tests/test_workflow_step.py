@@ -0,0 +1,106 @@
+import ast
+from textwrap import dedent
+
+from scargo.core import WorkflowParams
+
+# resolve and workflow_step import each other, resolve has to be imported first
+from scargo.transpile import resolve  # noqa: F401 pylint: disable=unused-import
+from scargo.transpile.types import Context, FileTmp, Origin, Parameter, Transput
+from scargo.transpile.workflow_step import WorkflowStep, generate_template, get_outputs, source_code
+
+
+def make_step(function_source: str) -> WorkflowStep:
+    functiondef_node = ast.parse(dedent(function_source)).body[0]
+    return WorkflowStep(
+        call_node=ast.Call(func=ast.Name(id=functiondef_node.name), args=[], keywords=[]),
+        name=functiondef_node.name,
+        hyphenated_name=functiondef_node.name.replace("_", "-"),
+        template_name=f"exec-{functiondef_node.name.replace('_', '-')}",
+        image="python:alpine",
+        inputs=Transput(parameters={"init-value": Parameter(value="1")}),
+        outputs=Transput(parameters={"out-value": Parameter()}, artifacts={"txt-out": FileTmp(path="out.txt")}),
+        functiondef_node=functiondef_node,
+    )
+
+
+def test_source_code_drops_docstring_only():
+    step = make_step(
+        '''
+        @scargo(image="python:alpine")
+        def add_alpha(scargo_in: ScargoInput, scargo_out: ScargoOutput) -> None:
+            """
+            Docstring.
+            """
+            print(scargo_in.parameters["init-value"])
+            scargo_out.parameters["out-value"] = "a"
+        '''
+    )
+
+    assert source_code(step) == (
+        "print('{{inputs.parameters.init-value}}')\n"
+        "with open('{{outputs.parameters.out-value.path}}', 'w+') as fi:\n"
+        "    fi.write('a')\n"
+    )
+
+
+def test_source_code_leaves_functiondef_untouched():
+    step = make_step(
+        """
+        @scargo(image="python:alpine")
+        def add_alpha(scargo_in: ScargoInput, scargo_out: ScargoOutput) -> None:
+            value = f"{scargo_in.parameters['init-value']}"
+            scargo_out.parameters["out-value"] = value
+            with scargo_out.artifacts["txt-out"].open() as fo:
+                fo.write(value)
+        """
+    )
+    original_dump = ast.dump(step.functiondef_node, include_attributes=True)
+
+    source_code(step)
+
+    assert ast.dump(step.functiondef_node, include_attributes=True) == original_dump
+
+
+def test_generate_template_does_not_share_static_parts():
+    step = make_step(
+        """
+        @scargo(image="python:alpine")
+        def add_alpha(scargo_in: ScargoInput, scargo_out: ScargoOutput) -> None:
+            scargo_out.parameters["out-value"] = "a"
+        """
+    )
+    first_template = generate_template(step)
+    second_template = generate_template(step)
+
+    first_template["initContainers"][0]["image"] = "alpine:edge"
+    first_template["script"]["resources"]["limits"]["memory"] = "1Gi"
+    first_template["script"]["volumeMounts"].clear()
+
+    assert second_template["initContainers"][0]["image"] == "alpine:latest"
+    assert second_template["script"]["resources"]["limits"]["memory"] == "30Mi"
+    assert second_template["script"]["volumeMounts"] == [{"name": "workdir", "mountPath": "/workdir"}]
+
+
+def test_get_outputs_reused_by_later_step():
+    """
+    Reusing a named ScargoOutput in a later step gives the later step its own origins, without changing the outputs
+    already resolved for the earlier step.
+    """
+    declared_outputs = Transput(parameters={"out-val": Parameter()})
+    context = Context(
+        locals={},
+        inputs={},
+        outputs={"shared_out": declared_outputs},
+        workflow_params=WorkflowParams({}),
+        mount_points={},
+        toplevel_funcs={},
+    )
+    call_node = ast.parse("add_alpha(scargo_in, shared_out)").body[0].value
+
+    first_outputs = get_outputs(call_node, context, "add-alpha")
+    second_outputs = get_outputs(call_node, context, "add-beta")
+
+    assert first_outputs.parameters["out-val"].origin == Origin(step="add-alpha", name="out-val")
+    assert second_outputs.parameters["out-val"].origin == Origin(step="add-beta", name="out-val")
+    assert context.outputs["shared_out"] is second_outputs
+    assert declared_outputs.parameters["out-val"].origin is None
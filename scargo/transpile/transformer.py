@@ -1,11 +1,54 @@
 import ast
-from typing import Optional, Union
+import functools
+import sys
+from typing import Any, Callable, Dict, Optional, Union
 
 from scargo.errors import ScargoTranspilerError
 from scargo.transpile import utils
 from scargo.transpile.types import Artifacts, FilePut, FileTmp, Transput
 
 
+@functools.lru_cache(maxsize=512, typed=True)
+def _format_reference(role: str, kind: str, key: Any) -> str:
+    """
+    Build the Argo template reference for a ScargoInput/ScargoOutput subscript, e.g. `{{inputs.parameters.x}}`.
+
+    Cached and interned, so repeated references to the same parameter/artifact share a single string object. The
+    cache is typed, since equal keys of different types (`1`, `1.0`, `True`) are formatted differently.
+    """
+    if role == "inputs" and kind == "parameters":
+        return sys.intern("{{" + f"{role}.{kind}.{key}" + "}}")
+    else:
+        return sys.intern("{{" + f"{role}.{kind}.{key}.path" + "}}")
+
+
+# Node types that can't (transitively) contain an Assign, Subscript or Call, the only nodes SourceToArgoTransformer
+# rewrites. These are returned as-is without visiting them or their fields.
+_LEAF_NODE_TYPES = frozenset(
+    {
+        ast.Name,
+        ast.Constant,
+        ast.alias,
+        *ast.expr_context.__subclasses__(),
+        *ast.boolop.__subclasses__(),
+        *ast.operator.__subclasses__(),
+        *ast.unaryop.__subclasses__(),
+        *ast.cmpop.__subclasses__(),
+    }
+)
+
+
+def _clone_node(node: ast.AST) -> ast.AST:
+    """
+    Shallow copy of an AST node.
+
+    Copies the instance dict directly, which is several times faster than `copy.copy` going through `__reduce_ex__`.
+    """
+    new_node = node.__class__.__new__(node.__class__)
+    new_node.__dict__.update(node.__dict__)
+    return new_node
+
+
 class SourceToArgoTransformer(ast.NodeTransformer):
     """
     Transforms the source code of a @scargo decorated function to be compatible
@@ -15,13 +58,22 @@ class SourceToArgoTransformer(ast.NodeTransformer):
     e.g. `scargo_in.parameters['x']` needs to be converted to
     `{{inputs.parameters.x}}`.
 
+    The transformer never modifies the tree it is given: nodes that (transitively) change are copied, while all
+    untouched subtrees are shared between the original and the transformed tree.
+
     Examples
     --------
     tree = ast.parse(source_code_of_scargo_decorated_function, type_comments=True)
-    # NOTE: changes tree in-place!! use copy.deepcopy if you want to avoid this
-    SourceToArgoTransformer("scargo_in", "scargo_out").visit(tree)
+    new_tree = SourceToArgoTransformer("scargo_in", inputs, "scargo_out", outputs).visit(tree)
     """
 
+    # node class -> visitor method, shared by all instances of a (sub)class
+    _visitor_cache: Dict[type, Callable[["SourceToArgoTransformer", ast.AST], Any]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visitor_cache = {}
+
     def __init__(self, input_argument: str, inputs: Transput, output_argument: str, outputs: Transput):
         """
         Create a new SourceToArgoTransformer.
@@ -40,6 +92,63 @@ class SourceToArgoTransformer(ast.NodeTransformer):
         self.output_argument = output_argument
         self.outputs = outputs
 
+    def visit(self, node: ast.AST) -> Any:
+        """
+        Dispatch to the `visit_<NodeClass>` method for `node`, looking the method up only once per node class.
+        """
+        node_class = type(node)
+        visitor = self._visitor_cache.get(node_class)
+        if visitor is None:
+            visitor = getattr(type(self), "visit_" + node_class.__name__, type(self).generic_visit)
+            self._visitor_cache[node_class] = visitor
+        return visitor(self, node)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        """
+        Copy-on-write version of `ast.NodeTransformer.generic_visit`.
+
+        Returns `node` itself if none of its children were transformed, otherwise a shallow copy of `node` with the
+        transformed children.
+        """
+        if type(node) in _LEAF_NODE_TYPES:
+            return node
+
+        changed_fields = {}
+        for field in node._fields:
+            old_value = getattr(node, field, None)
+            if isinstance(old_value, list):
+                new_values = []
+                changed = False
+                for value in old_value:
+                    if isinstance(value, ast.AST) and type(value) not in _LEAF_NODE_TYPES:
+                        new_value = self.visit(value)
+                        if new_value is not value:
+                            changed = True
+                        if new_value is None:
+                            continue
+                        if not isinstance(new_value, ast.AST):
+                            new_values.extend(new_value)
+                            continue
+                        value = new_value
+                    new_values.append(value)
+                if changed:
+                    changed_fields[field] = new_values
+            elif isinstance(old_value, ast.AST) and type(old_value) not in _LEAF_NODE_TYPES:
+                new_node = self.visit(old_value)
+                if new_node is not old_value:
+                    changed_fields[field] = new_node
+
+        if not changed_fields:
+            return node
+
+        new_node = _clone_node(node)
+        for field, new_value in changed_fields.items():
+            if new_value is None:
+                delattr(new_node, field)
+            else:
+                setattr(new_node, field, new_value)
+        return new_node
+
     def visit_Assign(self, node: ast.Assign) -> Union[ast.Assign, ast.With]:
         """
         Output parameters can be the target of assignment and needs to be transformed into a file output to be Argo
@@ -49,7 +158,7 @@ class SourceToArgoTransformer(ast.NodeTransformer):
         if isinstance(target, ast.Subscript):
             file_path = SourceToArgoTransformer._resolve_subscript(target, self.input_argument, self.output_argument)
             if file_path is not None:
-                return ast.With(
+                with_node = ast.With(
                     items=[
                         ast.withitem(
                             context_expr=ast.Call(
@@ -75,9 +184,9 @@ class SourceToArgoTransformer(ast.NodeTransformer):
                         )
                     ],
                 )
+                return ast.copy_location(with_node, node)
 
-        self.generic_visit(node)
-        return node
+        return self.generic_visit(node)
 
     def visit_Subscript(self, node: ast.Subscript) -> Union[ast.Subscript, ast.Constant]:
         """
@@ -88,8 +197,7 @@ class SourceToArgoTransformer(ast.NodeTransformer):
         if resolved_subscript is not None:
             return ast.Constant(value=resolved_subscript, kind=None, ctx=node.ctx)
         else:
-            self.generic_visit(node)
-            return node
+            return self.generic_visit(node)
 
     @staticmethod
     def _resolve_subscript(node: ast.Subscript, input_arg: str, output_arg: str) -> Optional[str]:
@@ -97,27 +205,31 @@ class SourceToArgoTransformer(ast.NodeTransformer):
         Given an ast.Subscript node, translates its content into a Argo workflow parameter reference.
         """
         node_attr = node.value
-        if not isinstance(node_attr, ast.Attribute):
+        if type(node_attr) is not ast.Attribute:
             # raise NotImplementedError("Expected Attribute value for this node.")
             return None
 
         attr_name = node_attr.value
-        if not isinstance(attr_name, ast.Name):
+        if type(attr_name) is not ast.Name:
             # raise NotImplementedError("Expected Attribute to have name.")
             return None
 
         node_slice = node.slice
-        if not isinstance(node_slice, ast.Constant):
+        if type(node_slice) is not ast.Constant:
             # raise NotImplementedError("Expected slice value to be constant.")
             return None
 
-        if attr_name.id == input_arg and node_attr.attr == "parameters":
-            return "{{" + f"inputs.{node_attr.attr}.{node_slice.value}" + "}}"
-        if attr_name.id == input_arg and node_attr.attr == "artifacts":
-            return "{{" + f"inputs.{node_attr.attr}.{node_slice.value}.path" + "}}"
-        elif attr_name.id == output_arg and (node_attr.attr == "parameters" or node_attr.attr == "artifacts"):
+        # bind the fields read more than once, this runs for every subscript in every @scargo function
+        kind = node_attr.attr
+        if kind != "parameters" and kind != "artifacts":
+            return None
+
+        arg_name = attr_name.id
+        if arg_name == input_arg:
+            return _format_reference("inputs", kind, node_slice.value)
+        elif arg_name == output_arg:
             # both output parameters and artifacts are output to files to be processed by Argo
-            return "{{" + f"outputs.{node_attr.attr}.{node_slice.value}.path" + "}}"
+            return _format_reference("outputs", kind, node_slice.value)
         else:
             return None
 
@@ -127,18 +239,11 @@ class SourceToArgoTransformer(ast.NodeTransformer):
         Given a node that either represent a normal string or an f-string,
         resolve the content of that string from the node.
         """
-        string_parts = []
         for value in node.values:
-            if isinstance(value, ast.Constant):
-                string_parts.append(value.value)
-            elif isinstance(value, ast.FormattedValue):
-                format_str_val = value.value
-                if isinstance(format_str_val, ast.Constant):
-                    string_parts.append(format_str_val.value)
-                else:
-                    raise NotImplementedError("Unimplemented f-string type.")
+            if type(value) is not ast.Constant and type(value.value) is not ast.Constant:
+                raise NotImplementedError("Unimplemented f-string type.")
 
-        return "".join(string_parts)
+        return "".join(value.value if type(value) is ast.Constant else value.value.value for value in node.values)
 
     @staticmethod
     def _resolve_open(
@@ -178,9 +283,10 @@ class SourceToArgoTransformer(ast.NodeTransformer):
 
                 if "file_name" in vars:
                     raw_path = vars["file_name"]
-                    if isinstance(raw_path, ast.Constant):
+                    raw_path_type = type(raw_path)
+                    if raw_path_type is ast.Constant:
                         path = raw_path.value
-                    elif isinstance(raw_path, ast.JoinedStr):
+                    elif raw_path_type is ast.JoinedStr:
                         path = SourceToArgoTransformer._resolve_string(raw_path)
                     else:
                         raise NotImplementedError(f"Unknown path type for file_name: {raw_path}")
@@ -218,9 +324,10 @@ class SourceToArgoTransformer(ast.NodeTransformer):
         """
         # Visit child nodes to ensure all nested nodes are transformed by the
         # custom `visit_Call` and `visit_Subscript` methods
-        self.generic_visit(node)
+        node = self.generic_visit(node)
 
-        if isinstance(node.func, ast.Attribute) and node.func.attr == "open":
+        # AST node classes are never subclassed, so an identity check is enough (and cheaper than isinstance)
+        if type(node.func) is ast.Attribute and node.func.attr == "open":
             return SourceToArgoTransformer._resolve_open(node, self.inputs.artifacts, self.outputs.artifacts)
         else:
             return node
@@ -8,9 +8,9 @@ from typing import Any, Dict, List, Union
 
 from scargo.core import MountPoints, WorkflowParams
 from scargo.errors import ScargoTranspilerError
-from scargo.transpile import entrypoint, yaml_io
+from scargo.transpile import entrypoint, utils, yaml_io
 from scargo.transpile.workflow_step import generate_template, WorkflowStep
-from scargo.transpile.types import FilePut
+from scargo.transpile.types import FileAny, FilePut
 
 
 def mount_points_from_locals(script_locals: Dict[str, Any]) -> Dict[str, str]:
@@ -56,6 +56,22 @@ def get_script_locals(source: str) -> Dict[str, Any]:
     return script_locals
 
 
+def _step_artifact_argument(name: str, artifact: FileAny) -> Dict[str, Any]:
+    """
+    Argo argument passing an input artifact to a step, either from S3 or from the step which produced it.
+    """
+    if isinstance(artifact, FilePut):
+        # TODO: it would be nice if the root was kept as a Workflow Parameter
+        return {
+            "name": name,
+            "s3": {"endpoint": "s3.amazonaws.com", "bucket": artifact.root, "key": artifact.path},
+        }
+    return {
+        "name": name,
+        "from": "{{" + f"steps.{artifact.origin.step}.outputs.artifacts.{artifact.origin.name}" + "}}",
+    }
+
+
 def build_step_template(step: WorkflowStep) -> Dict[str, Any]:
     """
     Transpile a WorkflowStep into it's corresponding Argo YAML.
@@ -63,46 +79,23 @@ def build_step_template(step: WorkflowStep) -> Dict[str, Any]:
     This involves declaring input parameters and artifacts, as well as optionally defining what condition is required
     for the step to run.
     """
-    all_parameters = []
-
-    if step.inputs.parameters is not None:
-        for name, param in step.inputs.parameters.items():
-            if param.origin is not None:
-                all_parameters.append(
-                    {
-                        "name": name,
-                        "value": "{{" + f"steps.exec-{param.origin.step}.outputs.parameters.{param.origin.name}" + "}}",
-                    }
-                )
-            else:
-                all_parameters.append(
-                    {
-                        "name": name,
-                        "value": param.value,
-                    }
-                )
-
-    all_artifacts = []
-
-    if step.inputs.artifacts is not None:
-        for name, artifact in step.inputs.artifacts.items():
-            if isinstance(artifact, FilePut):
-                # TODO: it would be nice if the root was kept as a Workflow Parameter
-                all_artifacts.append(
-                    {
-                        "name": name,
-                        "s3": {"endpoint": "s3.amazonaws.com", "bucket": artifact.root, "key": artifact.path},
-                    }
-                )
-            else:
-                all_artifacts.append(
-                    {
-                        "name": name,
-                        "from": "{{" + f"steps.{artifact.origin.step}.outputs.artifacts.{artifact.origin.name}" + "}}",
-                    }
-                )
-
-    all_args = dict()
+    inputs = step.inputs
+
+    all_parameters = [
+        {
+            "name": name,
+            "value": (
+                "{{" + f"steps.exec-{param.origin.step}.outputs.parameters.{param.origin.name}" + "}}"
+                if param.origin is not None
+                else param.value
+            ),
+        }
+        for name, param in (inputs.parameters or {}).items()
+    ]
+
+    all_artifacts = [_step_artifact_argument(name, artifact) for name, artifact in (inputs.artifacts or {}).items()]
+
+    all_args = {}
     if len(all_parameters) > 0:
         all_args["parameters"] = all_parameters
 
@@ -228,7 +221,7 @@ def transpile(path_to_script: Union[str, Path]) -> None:
     """
 
     path_to_script = Path(path_to_script)
-    hyphenated_script_name = path_to_script.stem.replace("_", "-")
+    hyphenated_script_name = utils.hyphenate(path_to_script.stem)
 
     with open(path_to_script, "r") as fi:
         source = fi.read()
@@ -254,5 +247,3 @@ def transpile(path_to_script: Union[str, Path]) -> None:
         workflow_steps=entrypoint_transpiler.steps,
     )
     yaml_io.write_workflow_to_yaml(path_to_script, transpiled_workflow)
-
-    print(ast.dump(tree, indent=3))
@@ -1,3 +1,4 @@
+import ast
 from typing import Any, Dict, NamedTuple, Optional, Union
 
 from scargo.core import WorkflowParams
@@ -55,7 +56,7 @@ class Transput(NamedTuple):
         True if at least one of the two class attributes is not None or an
         empty dict.
         """
-        return not self.parameters or not self.artifacts
+        return bool(self.parameters) or bool(self.artifacts)
 
 
 class Context(NamedTuple):
@@ -64,3 +65,5 @@ class Context(NamedTuple):
     outputs: Dict[str, Transput]
     workflow_params: WorkflowParams
     mount_points: Dict[str, str]
+    # top-level function definitions of the scargo script, indexed by name
+    toplevel_funcs: Dict[str, ast.FunctionDef]
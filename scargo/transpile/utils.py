@@ -4,7 +4,9 @@ Utility functions used in the transpilation process.
 import ast
 from typing import Any, Dict, List
 
-from scargo.core import MountPoints, WorkflowParams
+from scargo.core import WorkflowParams
+
+_HYPHEN_TABLE = str.maketrans("_", "-")
 
 
 def hyphenate(text: str) -> str:
@@ -13,30 +15,33 @@ def hyphenate(text: str) -> str:
 
     Python functions use underscores while Argo uses hyphens for Argo template names by convention.
     """
-    return text.replace("_", "-")
+    return text.translate(_HYPHEN_TABLE)
 
 
-def is_workflow_param(node: ast.Subscript, locals_context: Dict[str, Any]) -> bool:
+def index_toplevel_funcs(tree: ast.Module) -> Dict[str, ast.FunctionDef]:
     """
-    Checks if the subscripted node is a global WorkflowParams object.
+    Index the top-level function definitions of a module by function name, in a single pass over its children.
     """
-    object_name = node.value.id
-    return object_name in locals_context and isinstance(locals_context[object_name], WorkflowParams)
+    funcs = {}
+    for toplevel_node in ast.iter_child_nodes(tree):
+        if isinstance(toplevel_node, ast.FunctionDef) and toplevel_node.name not in funcs:
+            funcs[toplevel_node.name] = toplevel_node
+
+    return funcs
 
 
-def is_mount_points(node: ast.Subscript, locals_context: Dict[str, Any]) -> bool:
+def is_workflow_param(object_name: str, locals_context: Dict[str, Any]) -> bool:
     """
-    Checks if the subscripted node is a global MountPoints object.
+    Checks if the subscripted object name refers to a global WorkflowParams object.
     """
-    object_name = node.value.id
-    return object_name in locals_context and isinstance(locals_context[object_name], MountPoints)
+    return isinstance(locals_context.get(object_name), WorkflowParams)
 
 
 def get_variables_from_call(node: ast.Call, expected_args: List[str] = None) -> Dict[str, ast.expr]:
     """
     Get all args and kwargs from a function call AST node.
     """
-    all_vars = dict()
+    all_vars = {}
 
     for a_i, arg in enumerate(node.args):
         all_vars[expected_args[a_i]] = arg
@@ -1,14 +1,15 @@
 import ast
-import copy
 from typing import Any, Dict, NamedTuple, Optional
 
-import astor
-
 from scargo.errors import ScargoTranspilerError
 from scargo.transpile import resolve, utils
 from scargo.transpile.transformer import SourceToArgoTransformer
 from scargo.transpile.types import Context, FilePut, FileTmp, Origin, Parameter, Transput
 
+# paths inside the step container where input/output artifacts and output parameters are placed
+IN_PREFIX = "/workdir/in/"
+OUT_PREFIX = "/workdir/out/"
+
 
 class WorkflowStep(NamedTuple):
     """
@@ -17,36 +18,14 @@ class WorkflowStep(NamedTuple):
 
     call_node: ast.Call
     name: str
+    hyphenated_name: str
+    template_name: str
     image: str
     inputs: Transput
     outputs: Transput
     functiondef_node: ast.FunctionDef
     condition: Optional[str] = None
 
-    @property
-    def hyphenated_name(self) -> str:
-        """
-        Returns the name of the workflow step.
-        """
-        return utils.hyphenate(self.name)
-
-    @property
-    def template_name(self) -> str:
-        """
-        Returns the template name of the workflow step.
-        """
-        return f"exec-{self.hyphenated_name}"
-
-
-def get_functiondef_node(name: str, tree: ast.Module) -> Optional[ast.FunctionDef]:
-    """
-    Returns the FunctionDef node which represents the definition of the
-    Python function corresponding to this workflow step.
-    """
-    for toplevel_node in ast.iter_child_nodes(tree):
-        if isinstance(toplevel_node, ast.FunctionDef) and toplevel_node.name == name:
-            return toplevel_node
-
 
 def get_inputs(call_node: ast.Call, context: Context) -> Transput:
     """
@@ -81,28 +60,36 @@ def get_outputs(call_node: ast.Call, context: Context, name: str) -> Transput:
     if isinstance(output_node, ast.Call) and output_node.func.id == "ScargoOutput":
         scargo_outputs = resolve.resolve_transput(output_node, context)
     elif isinstance(output_node, ast.Name) and isinstance(context.outputs[output_node.id], Transput):
-        scargo_outputs = context.outputs[output_node.id]
-
-        if scargo_outputs.parameters is not None:
-            param_update = dict()
-            for key, param in scargo_outputs.parameters.items():
-                param_update[key] = Parameter(value=param.value, origin=Origin(step=name, name=key))
-
-            scargo_outputs.parameters.update(param_update)
-
-        if scargo_outputs.artifacts is not None:
-            artifact_update = dict()
-            for key, artifact in scargo_outputs.artifacts.items():
-                if isinstance(artifact, FileTmp):
-                    if artifact.origin is not None:
-                        raise ScargoTranspilerError(
-                            f"Assigning a TmpFile as output for {name}, but it's already been used as an output for"
-                            f"step {artifact.origin.step}"
-                        )
+        declared_outputs = context.outputs[output_node.id]
+
+        parameters = declared_outputs.parameters
+        if parameters is not None:
+            parameters = {
+                key: Parameter(value=param.value, origin=Origin(step=name, name=key))
+                for key, param in parameters.items()
+            }
+
+        artifacts = declared_outputs.artifacts
+        if artifacts is not None:
+            for artifact in artifacts.values():
+                if isinstance(artifact, FileTmp) and artifact.origin is not None:
+                    raise ScargoTranspilerError(
+                        f"Assigning a TmpFile as output for {name}, but it's already been used as an output for"
+                        f"step {artifact.origin.step}"
+                    )
 
-                    artifact_update[key] = FileTmp(path=artifact.path, origin=Origin(step=name, name=key))
+            artifacts = {
+                key: (
+                    FileTmp(path=artifact.path, origin=Origin(step=name, name=key))
+                    if isinstance(artifact, FileTmp)
+                    else artifact
+                )
+                for key, artifact in artifacts.items()
+            }
 
-            scargo_outputs.artifacts.update(artifact_update)
+        # replace (rather than mutate) the declared outputs, so later steps resolve them with their origin
+        scargo_outputs = Transput(parameters=parameters, artifacts=artifacts)
+        context.outputs[output_node.id] = scargo_outputs
     else:
         raise ScargoTranspilerError(
             "Unexpected input type. Second argument to a @scargo function must be a `ScargoOutput`."
@@ -111,20 +98,42 @@ def get_outputs(call_node: ast.Call, context: Context, name: str) -> Transput:
     return scargo_outputs
 
 
+def get_scargo_decorator(functiondef_node: ast.FunctionDef) -> Optional[ast.Call]:
+    """
+    Get the `@scargo(...)` decorator node of a function, if it has one.
+    """
+    return next(
+        (
+            d
+            for d in functiondef_node.decorator_list
+            if isinstance(d, ast.Call) and isinstance(d.func, ast.Name) and d.func.id == "scargo"
+        ),
+        None,
+    )
+
+
 def get_image(functiondef_node: ast.FunctionDef) -> str:
     """
     Get image argument from @scargo(image=image_name)
+
+    The image is stored on the node on first resolution, since the same function can be called from several steps.
     """
-    scargo_decorator_node = list(filter(lambda d: d.func.id == "scargo", functiondef_node.decorator_list))[0]
-    assert isinstance(scargo_decorator_node, ast.Call)
+    image = getattr(functiondef_node, "_scargo_image", None)
+    if image is not None:
+        return image
+
+    scargo_decorator_node = get_scargo_decorator(functiondef_node)
+    if scargo_decorator_node is None:
+        raise ScargoTranspilerError(f"No @scargo decorator found for function: {functiondef_node.name}")
     image_node = utils.get_variables_from_call(scargo_decorator_node, ["image"])["image"]
     assert isinstance(image_node, ast.Constant)
+
+    functiondef_node._scargo_image = image_node.value
     return image_node.value
 
 
 def make_workflow_step(
     call_node: ast.Call,
-    tree: ast.Module,
     context: Context,
     condition: Optional[str] = None,
 ) -> WorkflowStep:
@@ -136,16 +145,19 @@ def make_workflow_step(
     """
 
     name = call_node.func.id
-    functiondef_node = get_functiondef_node(name, tree)
+    functiondef_node = context.toplevel_funcs.get(name)
     if functiondef_node is None:
         raise ScargoTranspilerError(f"No function definition found for name: {name}")
 
+    hyphenated_name = utils.hyphenate(name)
     return WorkflowStep(
         call_node=call_node,
         name=name,
+        hyphenated_name=hyphenated_name,
+        template_name=f"exec-{hyphenated_name}",
         image=get_image(functiondef_node),
         inputs=get_inputs(call_node, context),
-        outputs=get_outputs(call_node, context, utils.hyphenate(name)),
+        outputs=get_outputs(call_node, context, hyphenated_name),
         functiondef_node=functiondef_node,
         condition=condition,
     )
@@ -166,18 +178,25 @@ def source_code(step: WorkflowStep) -> Optional[str]:
     output_arg_name = function_args[1].arg
 
     # Resolves f-strings with WorkflowParams/MountPoints
+    # the transformer copies only the nodes it changes, so the original FunctionDef is left untouched
     converted_functiondef = SourceToArgoTransformer(input_arg_name, step.inputs, output_arg_name, step.outputs).visit(
-        copy.deepcopy(step.functiondef_node)
+        step.functiondef_node
     )
 
+    # only the first statement of a function body can be its docstring
+    body = converted_functiondef.body
+    first_node = body[0]
+    if (
+        isinstance(first_node, ast.Expr)
+        and isinstance(first_node.value, ast.Constant)
+        and isinstance(first_node.value.value, str)
+    ):
+        body = body[1:]
+
     # TODO: format the output source with black
     # https://gitlab.proteinqure.com/pq/platform/core/scargo/-/issues/20
-    source = []
-    for node in converted_functiondef.body:
-        if not isinstance(node, ast.Expr):  # if it's not a docstring
-            source.append(astor.to_source(node))
-
-    return "".join(source)
+    source = ast.unparse(ast.Module(body=body, type_ignores=[]))
+    return f"{source}\n" if source else source
 
 
 def generate_template(step: WorkflowStep) -> Dict[str, Any]:
@@ -185,94 +204,82 @@ def generate_template(step: WorkflowStep) -> Dict[str, Any]:
     Returns the dictionary defining the Argo template for this workflow
     step.
     """
+    inputs, outputs = step.inputs, step.outputs
 
-    template: Dict[str, Any] = {"name": step.template_name}
+    inputs_section = {}
 
-    inputs_section = {"inputs": dict()}
+    if inputs.parameters is not None:
+        inputs_section["parameters"] = [{"name": key} for key in inputs.parameters]
 
-    if step.inputs.parameters is not None:
-        inputs_section["inputs"]["parameters"] = [{"name": key} for key in step.inputs.parameters]
+    if inputs.artifacts is not None:
+        inputs_section["artifacts"] = [{"name": name, "path": IN_PREFIX + name} for name in inputs.artifacts]
 
-    if step.inputs.artifacts is not None:
-        inputs_section["inputs"]["artifacts"] = [
-            dict({"name": name, "path": f"/workdir/in/{name}"}) for name in step.inputs.artifacts
-        ]
-
-    template.update(inputs_section)
+    outputs_section = {}
 
-    outputs_section = {"outputs": dict()}
-
-    if step.outputs.parameters is not None:
-        outputs_section["outputs"]["parameters"] = [
-            {"name": name, "valueFrom": {"path": f"/workdir/out/{name}"}} for name in step.outputs.parameters
+    if outputs.parameters is not None:
+        outputs_section["parameters"] = [
+            {"name": name, "valueFrom": {"path": OUT_PREFIX + name}} for name in outputs.parameters
         ]
 
-    if step.outputs.artifacts is not None:
+    if outputs.artifacts is not None:
         artifacts = []
-        for name, file_output in step.outputs.artifacts.items():
+        for name, file_output in outputs.artifacts.items():
             if isinstance(file_output, FilePut):
                 artifacts.append(
-                    dict(
-                        {
-                            "name": name,
-                            "path": "/workdir/out",
-                            "s3": {
-                                "endpoint": "s3.amazonaws.com",
-                                "bucket": file_output.root,
-                                "key": file_output.path,
-                            },
-                        }
-                    )
+                    {
+                        "name": name,
+                        "path": "/workdir/out",
+                        "s3": {
+                            "endpoint": "s3.amazonaws.com",
+                            "bucket": file_output.root,
+                            "key": file_output.path,
+                        },
+                    }
                 )
             elif isinstance(file_output, FileTmp):
                 artifacts.append(
-                    dict(
-                        {
-                            "name": name,
-                            "path": f"/workdir/out/{name}",
-                        }
-                    )
+                    {
+                        "name": name,
+                        "path": OUT_PREFIX + name,
+                    }
                 )
             else:
                 raise ScargoTranspilerError("Only FilPut and FileTmp supported.")
 
-        outputs_section["outputs"]["artifacts"] = artifacts
-
-    template.update(outputs_section)
-
-    template.update(
-        {
-            "initContainers": [
-                {
-                    "name": "mkdir",
-                    "image": "alpine:latest",
-                    "command": ["mkdir", "-p", "/workdir/out", "/workdir/in"],
-                    "mirrorVolumeMounts": True,
-                },
-                {
-                    "name": "chmod",
-                    "image": "alpine:latest",
-                    "command": ["chmod", "-R", "a+rwX", "/workdir"],
-                    "mirrorVolumeMounts": True,
+        outputs_section["artifacts"] = artifacts
+
+    return {
+        "name": step.template_name,
+        "inputs": inputs_section,
+        "outputs": outputs_section,
+        "initContainers": [
+            {
+                "name": "mkdir",
+                "image": "alpine:latest",
+                "command": ["mkdir", "-p", "/workdir/out", "/workdir/in"],
+                "mirrorVolumeMounts": True,
+            },
+            {
+                "name": "chmod",
+                "image": "alpine:latest",
+                "command": ["chmod", "-R", "a+rwX", "/workdir"],
+                "mirrorVolumeMounts": True,
+            },
+        ],
+        "script": {
+            "image": step.image,
+            "command": ["python"],  # TODO: needs to be dynamic
+            "source": source_code(step),
+            "resources": {
+                "requests": {
+                    "memory": "30Mi",
+                    "cpu": "20m",
                 },
-            ],
-            "script": {
-                "image": step.image,
-                "command": ["python"],  # TODO: needs to be dynamic
-                "source": source_code(step),
-                "resources": {
-                    "requests": {
-                        "memory": "30Mi",
-                        "cpu": "20m",
-                    },
-                    "limits": {
-                        "memory": "30Mi",
-                        "cpu": "20m",
-                    },
+                "limits": {
+                    "memory": "30Mi",
+                    "cpu": "20m",
                 },
-                "volumeMounts": [{"name": "workdir", "mountPath": "/workdir"}],  # TODO: only include if needed
             },
-        }
-    )
-
-    return template
+            "volumeMounts": [{"name": "workdir", "mountPath": "/workdir"}],  # TODO: only include if needed
+        },
+    }
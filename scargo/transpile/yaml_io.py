@@ -3,12 +3,22 @@ from typing import Any, Dict
 import yaml
 
 from scargo.core import WorkflowParams
+from scargo.transpile.utils import hyphenate
+
+# libyaml's emitter is much faster, but fall back to the pure-Python one if PyYAML was built without it
+try:
+    from yaml import CSafeDumper as _FastDumper
+except ImportError:
+    from yaml import SafeDumper as _FastDumper
 
 
 class ArgoYamlDumper(yaml.SafeDumper):
     """
     Custom YAML dumper to generate Argo-compatible YAML files.
 
+    This has to stay on the pure-Python SafeDumper: libyaml's emitter (CSafeDumper) never calls `write_line_break`, so
+    the blank lines between top-level objects would be lost.
+
     Inspired by https://stackoverflow.com/a/44284819/3786245
     """
 
@@ -22,27 +32,28 @@ class ArgoYamlDumper(yaml.SafeDumper):
             super().write_line_break()
 
 
-def write_workflow_to_yaml(path_to_script: Path, transpiled_workflow: Dict[str, Any]) -> None:
+def repr_str(dumper: ArgoYamlDumper, data: str) -> yaml.ScalarNode:
     """
-    Writes the `transpiled_workflow` to a YAML file in the same directory as the
-    original Python input script.
+    Custom string representation to ensure a leading "|" followed by a
+    line break in the source section of the Argo YAML workflow file.
     """
+    if "\n" in data:
+        return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    return dumper.org_represent_str(data)
 
-    def repr_str(dumper, data):
-        """
-        Custom string representation to ensure a leading "|" followed by a
-        line break in the source section of the Argo YAML workflow file.
-        """
-        if "\n" in data:
-            return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
-        return dumper.org_represent_str(data)
 
-    # back up the default string representer and register the custom one
-    ArgoYamlDumper.org_represent_str = ArgoYamlDumper.represent_str
-    yaml.add_representer(str, repr_str, Dumper=ArgoYamlDumper)
+# back up the default string representer and register the custom one, once for all dumps
+ArgoYamlDumper.org_represent_str = ArgoYamlDumper.represent_str
+yaml.add_representer(str, repr_str, Dumper=ArgoYamlDumper)
 
-    filename = f"{path_to_script.stem.replace('_', '-')}.yaml"
-    with open(path_to_script.parent / filename, "w+") as yaml_out:
+
+def write_workflow_to_yaml(path_to_script: Path, transpiled_workflow: Dict[str, Any]) -> None:
+    """
+    Writes the `transpiled_workflow` to a YAML file in the same directory as the
+    original Python input script.
+    """
+    filename = f"{hyphenate(path_to_script.stem)}.yaml"
+    with open(path_to_script.parent / filename, "w", buffering=1 << 20) as yaml_out:
         yaml.dump(transpiled_workflow, yaml_out, Dumper=ArgoYamlDumper, sort_keys=False)
 
 
@@ -52,6 +63,6 @@ def write_params_to_yaml(path_to_script: Path, parameters: WorkflowParams) -> No
     original Python input script.
     """
 
-    filename = f"{path_to_script.stem.replace('_', '-')}-parameters.yaml"
-    with open(path_to_script.parent / filename, "w+") as yaml_out:
-        yaml.dump(dict(parameters), yaml_out)
+    filename = f"{hyphenate(path_to_script.stem)}-parameters.yaml"
+    with open(path_to_script.parent / filename, "w", buffering=1 << 20) as yaml_out:
+        yaml.dump(dict(parameters), yaml_out, Dumper=_FastDumper)
@@ -2,27 +2,160 @@
 Definition of all invoke CLI commands for this project.
 """
 
+import hashlib
+import shlex
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
 from invoke import task
+from invoke.exceptions import Exit
 
 
 project_name = "scargo"
+check_cache = Path(".scargo-check-cache")
+
+
+def check_hash(tool_versions: str, paths: List[str]) -> str:
+    """
+    Hash of everything the outcome of `check` depends on: the versions of the tools, their configuration in
+    pyproject.toml and the Python files in `paths`.
+    """
+    hasher = hashlib.blake2b(tool_versions.encode())
+    for file in [Path("pyproject.toml"), *sorted(file for path in paths for file in Path(path).rglob("*.py"))]:
+        hasher.update(str(file).encode())
+        hasher.update(file.read_bytes())
+    return hasher.hexdigest()
+
+
+def run_streaming(command: str, prefix: str) -> int:
+    """
+    Runs a shell command and forwards each line of its output (stdout and stderr) as soon as it is written, prefixed
+    with `[prefix]`. Returns the exit code of the command.
+    """
+    with subprocess.Popen(
+        command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True
+    ) as process:
+        for line in process.stdout:
+            sys.stdout.write(f"[{prefix}] {line}")
+            sys.stdout.flush()
+    return process.returncode
+
+
+def run_concurrently(commands: Dict[str, str]) -> None:
+    """
+    Runs independent shell commands (by prefix) concurrently with `run_streaming`, exits if any of them fails.
+    """
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        exit_codes = dict(zip(commands, executor.map(run_streaming, commands.values(), commands.keys())))
+
+    failed_commands = [prefix for prefix, exit_code in exit_codes.items() if exit_code != 0]
+    if failed_commands:
+        raise Exit(f"Failed: {', '.join(failed_commands)}", code=1)
+
+
+def poetry_env_path(c) -> Optional[Path]:
+    """
+    Path of the poetry environment of this project, None if it hasn't been created yet.
+    """
+    env_info = c.run("poetry env info --path", hide=True, warn=True)
+    env_path = env_info.stdout.strip()
+    return Path(env_path) if env_info.ok and env_path else None
 
 
 @task
-def install(c):
+def install(c, force=False, no_dev=False):
     """
-    Install all requirements and setup poetry environment.
+    Install all requirements and setup poetry environment. Use '--no-dev' to skip the development dependencies (and
+    the pre-commit hooks).
+
+    A hash of poetry.lock and pyproject.toml is stored in the poetry environment after a successful install, and the
+    install is skipped while they don't change. Use '--force' to install anyway.
     """
-    c.run("poetry install")
-    c.run("poetry run pre-commit install")
+    lock_hash = hashlib.blake2b(
+        Path("poetry.lock").read_bytes() + Path("pyproject.toml").read_bytes() + str(no_dev).encode()
+    ).hexdigest()
+
+    env_path = poetry_env_path(c)
+    hash_file = env_path / ".poetry-lock-hash" if env_path is not None else None
+    if not force and hash_file is not None and hash_file.is_file() and hash_file.read_text() == lock_hash:
+        print("install: up-to-date")
+        return
+
+    if no_dev:
+        c.run("poetry install --no-dev")
+    else:
+        c.run("poetry install")
+        c.run("poetry run pre-commit install")
+
+    # without a virtualenv (e.g. `virtualenvs.create false` in CI) there is nowhere to store the hash, always install
+    env_path = poetry_env_path(c)
+    if env_path is not None:
+        (env_path / ".poetry-lock-hash").write_text(lock_hash)
 
 
 @task
-def check(c, fix=True):
+def check(c, fix=True, force=False, files=None):
     """
-    Runs all static checks; black and pylint. If 'fix == False', black will
+    Runs the fast static checks; black and ruff. If 'fix == False', black will
+    only check the files and not modify them. Use '--no-fix' to disable
+    auto-fixing. See `check-deep` for the slower, more thorough checks with pylint.
+
+    The ruff rules (and the ones ignored) are configured under [tool.ruff] in pyproject.toml. Without auto-fixing,
+    nothing is modified and black and ruff run concurrently, with each line of output prefixed by the tool it comes
+    from.
+
+    After the checks pass, a hash of the checked files is stored in .scargo-check-cache and the checks are skipped
+    while nothing changes. Use '--force' to run them anyway.
+
+    Use '--files' to only check the given (comma separated) files instead, e.g. the files staged for a commit. This
+    bypasses .scargo-check-cache, which only covers full runs.
+    """
+
+    check_command = ""
+    if not fix:
+        check_command = " --check "
+
+    if files is not None:
+        file_list = " ".join(shlex.quote(file.strip()) for file in files.split(",") if file.strip())
+        black_commands = {"black": f"black {check_command} {file_list}"}
+        ruff_command = f"ruff check --force-exclude {file_list}"
+    else:
+        check_paths = [f"{project_name}/", "examples/"]
+        tool_versions = c.run("black --version", hide=True).stdout + c.run("ruff --version", hide=True).stdout
+        if not force and check_cache.is_file() and check_cache.read_text() == check_hash(tool_versions, check_paths):
+            print("check: up-to-date")
+            return
+
+        black_commands = {f"black {path}": f"black {check_command} {path}" for path in check_paths}
+        ruff_command = f"ruff check {' '.join(check_paths)}"
+
+    if fix:
+        # black may modify the files, so it has to be done before they are checked for style
+        print("Black")
+        for command in black_commands.values():
+            c.run(command)
+        print("Style checks")
+        c.run(ruff_command)
+    else:
+        run_concurrently({**black_commands, "ruff": ruff_command})
+
+    if files is None:
+        # only reached if all checks passed, hashed after black since it may have modified the files
+        check_cache.write_text(check_hash(tool_versions, check_paths))
+
+
+@task
+def check_deep(c, fix=True):
+    """
+    Runs the thorough static checks; black and pylint. If 'fix == False', black will
     only check the files and not modify them. Use '--no-fix' to disable
     auto-fixing.
+
+    Pylint's inference catches more than ruff, but is much slower. Use this before a release or in CI rather than
+    before every commit. Pylint is configured under [tool.pylint] in pyproject.toml.
     """
 
     check_command = ""
@@ -33,12 +166,29 @@ def check(c, fix=True):
     c.run(f"black {check_command} {project_name}/")
     c.run(f"black {check_command} examples/")
     print("Style checks")
-    c.run(f"pylint {project_name}/ --output-format=colorized")
-    c.run(f"pylint examples/ --output-format=colorized")
+    run_concurrently(
+        {
+            f"pylint {project_name}/": f"pylint {project_name}/ --output-format=colorized",
+            "pylint examples/": "pylint examples/ --output-format=colorized",
+        }
+    )
 
 
 @task
-def test(c, coverage=False, html_report=False, keyword=None):
+def test(
+    c,
+    coverage=False,
+    html_report=False,
+    keyword=None,
+    failed_first=False,
+    last_failed=False,
+    new_first=False,
+    jobs=None,
+    testmon=False,
+    fast_coverage=True,
+    shard=None,
+    shards=None,
+):
     """
     Run tests using pytest.
 
@@ -51,24 +201,75 @@ def test(c, coverage=False, html_report=False, keyword=None):
         the index.html in a browser and view the interactive coverage report.
     keyword : str, optional
         Subselects tests given the provided substring/keyword. Works exactly like the `pytest` `-k` flag.
+    failed_first : bool
+        Run the tests that failed in the previous run first, then the rest. Works exactly like the `pytest`
+        `--failed-first` flag.
+    last_failed : bool
+        Only rerun the tests that failed in the previous run (or all tests if none failed). Works exactly like the
+        `pytest` `--last-failed` flag.
+    new_first : bool
+        Run the tests from new and recently modified test files first. Works exactly like the `pytest` `--new-first`
+        flag.
+    jobs : str, optional
+        Number of processes to distribute the tests over with `pytest-xdist`, e.g. "4" or "auto" (one per CPU). Tests
+        are distributed per file, so tests writing the same files (e.g. transpiled examples) never run concurrently.
+        Ignored together with `coverage`, since `coverage run` only measures the main process.
+    testmon : bool
+        Only run the tests affected by the changes since the last `--testmon` run, using `pytest-testmon`. The
+        dependencies of each test are recorded in the (git-ignored) .testmondata file in the repository root; delete it
+        to rebuild them from a full run. Without this flag the file is neither read nor updated.
+    fast_coverage : bool
+        Measure coverage with the `sys.monitoring` based core of `coverage` (COVERAGE_CORE=sysmon), which is much
+        faster than its default trace function. Only used if the Python that runs the tests is 3.12+, older versions
+        always use the default core. Use '--no-fast-coverage' to always use the default core.
+    shard : int, optional
+        Only run the `shard`-th (0-based) of `shards` disjoint parts of the test suite, using `pytest-shard`. Meant for
+        splitting the suite over parallel CI jobs; combine their coverage data with `coverage combine` afterwards.
+    shards : int, optional
+        Number of parts to split the test suite into, required together with `shard`.
+
+    The outcome of the previous run is stored by pytest in the (git-ignored) .pytest_cache/ directory.
 
     Example usage:
         inv test
         inv test -k TestUtils
         inv test --coverage --html-report
         inv test --coverage --html-report -k TestUtils
+        inv test --last-failed
+        inv test --jobs auto
+        inv test --testmon
+        inv test --shard 0 --shards 4
     """
 
-    if keyword is None:
-        keyword_filter = ""
-    else:
-        keyword_filter = f"-k {keyword}"
-    test_command = f"pytest -vvv {keyword_filter} . --color=yes"
+    pytest_options = ["-vvv"]
+    if keyword is not None:
+        pytest_options.append(f"-k {keyword}")
+    if failed_first:
+        pytest_options.append("--failed-first")
+    if last_failed:
+        pytest_options.append("--last-failed")
+    if new_first:
+        pytest_options.append("--new-first")
+    if jobs is not None and not coverage:
+        pytest_options.append(f"-n {jobs} --dist=loadfile")
+    if testmon:
+        pytest_options.append("--testmon")
+    if shard is not None or shards is not None:
+        if shard is None or shards is None:
+            raise Exit("--shard and --shards have to be used together.", code=1)
+        pytest_options.append(f"--shard-id={shard} --num-shards={shards}")
+    test_command = f"pytest {' '.join(pytest_options)} . --color=yes"
 
+    test_env = {}
     if coverage:
         test_command = f"coverage run -m {test_command}"
+        if fast_coverage:
+            # check the Python that runs the tests (e.g. the poetry env), it can differ from the one running invoke
+            has_sysmon = c.run('python -c "import sys; sys.exit(sys.version_info < (3, 12))"', hide=True, warn=True).ok
+            if has_sysmon:
+                test_env["COVERAGE_CORE"] = "sysmon"
 
-    c.run(test_command)
+    c.run(test_command, env=test_env)
 
     if coverage:
         c.run("coverage report -m")